@@ -1,10 +1,17 @@
 # app/adif_import.py
 
 import re
+from contextlib import closing
 from datetime import datetime
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 
-from app.database import add_qso, qso_exists
+from app.database import (
+    add_qsos_bulk,
+    analyze_qsos,
+    get_qso_keys,
+    sync_qso_entities,
+    write_connection,
+)
 
 
 # -------------------------------------------------------------------
@@ -25,11 +32,20 @@ SUPPORTED_BANDS = [
     "6m",
 ]
 
+# ADIF band (lower case) -> our band name, one lookup per record
+_BAND_LOOKUP = {b.lower(): b for b in SUPPORTED_BANDS}
+
+# New QSOs are written in transactions of this many rows
+IMPORT_BATCH_SIZE = 10_000
+
 
 # -------------------------------------------------------------------
 # ADIF parser
 # -------------------------------------------------------------------
 
+_EOR_RE = re.compile(r"<eor>", re.IGNORECASE)
+
+
 def parse_adif_file(path: str) -> List[Tuple[str, str, str, str, str]]:
     """
     Parse an ADIF file and return a list of tuples:
@@ -40,15 +56,39 @@ def parse_adif_file(path: str) -> List[Tuple[str, str, str, str, str]]:
         - "Requested"
         - "Needed"
     """
+    return list(iter_adif_file(path))
+
+
+def iter_adif_file(path: str) -> Iterator[Tuple[str, str, str, str, str]]:
+    """
+    Same records as parse_adif_file(), yielded one at a time.
+    """
+    for _offset, record in _iter_adif_records(_read_adif(path)):
+        yield record
+
+
+def _read_adif(path: str) -> str:
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        content = f.read()
+        return f.read()
 
-    # Split records on <EOR>
-    records = re.split(r"<eor>", content, flags=re.IGNORECASE)
 
-    results: List[Tuple[str, str, str, str, str]] = []
+def _split_records(content: str) -> Iterator[Tuple[int, str]]:
+    """
+    (end offset, text) of each <EOR>-terminated record - walks the
+    file instead of building a list of every record's text.
+    """
+    pos = 0
+    for m in _EOR_RE.finditer(content):
+        yield m.end(), content[pos:m.start()]
+        pos = m.end()
+    yield len(content), content[pos:]
+
 
-    for rec in records:
+def _iter_adif_records(content: str):
+    """
+    Yields (end offset, record tuple); the offset drives import progress.
+    """
+    for offset, rec in _split_records(content):
         rec = rec.strip()
         if not rec:
             continue
@@ -78,10 +118,11 @@ def parse_adif_file(path: str) -> List[Tuple[str, str, str, str, str]]:
         date_str = ""
 
         if len(raw_date) == 8 and raw_date.isdigit():
+            # YYYYMMDD -> YYYY-MM-DD by slicing; datetime() only validates
             try:
-                dt = datetime.strptime(raw_date, "%Y%m%d")
-                date_str = dt.strftime("%Y-%m-%d")
-            except Exception:
+                datetime(int(raw_date[:4]), int(raw_date[4:6]), int(raw_date[6:]))
+                date_str = f"{raw_date[:4]}-{raw_date[4:6]}-{raw_date[6:]}"
+            except ValueError:
                 date_str = raw_date
         else:
             date_str = raw_date
@@ -90,13 +131,7 @@ def parse_adif_file(path: str) -> List[Tuple[str, str, str, str, str]]:
         # Band
         # -----------------------------
         raw_band = fields.get("BAND", "").lower().strip()
-        band = ""
-
-        if raw_band.endswith("m") or raw_band.endswith("cm"):
-            for b in SUPPORTED_BANDS:
-                if raw_band == b.lower():
-                    band = b
-                    break
+        band = _BAND_LOOKUP.get(raw_band, "")
 
         # -----------------------------
         # QSL status (LoTW / ARRL logic)
@@ -113,9 +148,7 @@ def parse_adif_file(path: str) -> List[Tuple[str, str, str, str, str]]:
         else:
             status = "Needed"
 
-        results.append((country, call, date_str, status, band))
-
-    return results
+        yield offset, (country, call, date_str, status, band)
 
 
 # -------------------------------------------------------------------
@@ -135,40 +168,55 @@ def import_adif(
     Skips duplicates automatically.
     """
     
-    records = parse_adif_file(path)
+    content = _read_adif(path)
+    size = len(content) or 1
 
     inserted = 0
     skipped = 0
-    total = len(records)
-
-    for i, (country, call, date, status, band) in enumerate(records, start=1):
+    total = 0
+
+    pending = []
+    # Keys already in the DB plus those queued from this file
+    seen = get_qso_keys(user)
+
+    # One connection for every batch plus the follow-up sync and ANALYZE,
+    # instead of reconnecting for each
+    with closing(write_connection()) as con:
+        # Records are parsed as they are imported; only the pending batch
+        # is held in memory
+        for offset, (country, call, date, status, band) in _iter_adif_records(content):
+            total += 1
         
-        if cancel_flag and cancel_flag.get("value"):
-            break
+            if cancel_flag and cancel_flag.get("value"):
+                break
             
-        if not date:
-            continue
+            if not date:
+                continue
 
-        existing = qso_exists(user, call, date, band)
-        if existing:
-            skipped += 1
-            continue
+            key = (call, date, band)
+            if key in seen:
+                skipped += 1
+                continue
+
+            seen.add(key)
+            pending.append((country, call, date, status, band))
 
-        add_qso(
-            user=user,
-            country=country,
-            call_worked=call,
-            date=date,
-            status=status,
-            band=band,
-        )
-        inserted += 1
+            if len(pending) >= IMPORT_BATCH_SIZE:
+                inserted += add_qsos_bulk(user, pending, con)
+                pending = []
         
-        # 🔹 Progress callback
-        if on_progress:
-            percent = int((i / total) * 100)
-            on_progress(percent, f"Imported {i}/{total}")
-            
+            # 🔹 Progress callback
+            if on_progress:
+                percent = int((offset / size) * 100)
+                on_progress(percent, f"Imported {total} records")
+
+        if pending:
+            inserted += add_qsos_bulk(user, pending, con)
+
+        if inserted:
+            sync_qso_entities(con)
+            analyze_qsos(con)
+
     result = {
         "added": inserted,
         "skipped": skipped,
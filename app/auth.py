@@ -4,6 +4,16 @@ import hashlib
 import sqlite3
 from app.database import DB_PATH, init_db
 
+# init_db() only has to run once per process, not on every login
+_db_ready = False
+
+
+def _ensure_db():
+    global _db_ready
+    if not _db_ready:
+        init_db()
+        _db_ready = True
+
 
 def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode()).hexdigest()
@@ -16,7 +26,7 @@ def register_user(callsign: str, password: str):
     if not callsign or not password:
         return False, "Callsign and password required."
 
-    init_db()  # ensure tables exist
+    _ensure_db()  # ensure tables exist
     con = sqlite3.connect(DB_PATH)
     cur = con.cursor()
 
@@ -37,7 +47,7 @@ def authenticate(callsign: str, password: str):
     callsign = callsign.strip().upper()
     password = password.strip()
 
-    init_db()
+    _ensure_db()
     con = sqlite3.connect(DB_PATH)
     cur = con.cursor()
     cur.execute(
@@ -7,3 +7,8 @@ DB_PATH = os.environ.get(
     "DXCC_DB_PATH",
     os.path.join(os.path.dirname(__file__), "dxcc.db"),
 )
+
+# Where the upload API stages ADIF files before importing them. Unset
+# means the system temp dir; pointing it at tmpfs (/dev/shm) keeps uploads
+# off the disk, but Docker only gives /dev/shm 64 MiB by default
+UPLOAD_TMP_DIR = os.environ.get("DXCC_UPLOAD_TMP_DIR") or None
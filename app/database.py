@@ -1,11 +1,64 @@
+# app/database.py
+#
+# Read-heavy queries (dashboard, QSO table) share one long-lived
+# connection opened with PRAGMA mmap_size, so SQLite serves pages from
+# a memory map instead of a read() syscall per page and keeps its page
+# cache warm between refreshes. Keep the pragma when changing this.
+
 import os
 import sqlite3
 import shutil
+import threading
+from contextlib import contextmanager
 from datetime import datetime, UTC
 
 from app import dxcc_prefixes
 from app.config import DB_PATH
 
+# 256 MiB - larger than any realistic log, SQLite maps only what exists
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Only takes effect when the database file is first created
+PAGE_SIZE = 8192
+
+# qsl_status values that count an entity as confirmed
+CONFIRMED_STATUSES = frozenset({"Confirmed", "LoTW", "QSL"})
+
+
+# ------------------------------------------------------------
+# Shared read connection
+# ------------------------------------------------------------
+
+_read_con = None
+_read_lock = threading.Lock()
+
+
+@contextmanager
+def read_cursor():
+    """
+    Cursor on the shared read-only connection.
+    Flet handlers run on worker threads, so access is serialized.
+    """
+    global _read_con
+
+    with _read_lock:
+        if _read_con is None:
+            _read_con = sqlite3.connect(
+                DB_PATH,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            _read_con.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            _read_con.execute("PRAGMA query_only=1")
+            _read_con.execute("PRAGMA cache_size=-20000")
+            _read_con.execute("PRAGMA temp_store=MEMORY")
+
+        cur = _read_con.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+
 
 # ------------------------------------------------------------
 # Init / migration
@@ -13,9 +66,18 @@ from app.config import DB_PATH
 
 def init_db():
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    is_new = not os.path.exists(DB_PATH)
+
     con = sqlite3.connect(DB_PATH)
     cur = con.cursor()
 
+    if is_new:
+        cur.execute(f"PRAGMA page_size={PAGE_SIZE}")
+
+    # WAL lets the UI keep reading while an import writes. The mode is
+    # stored in the database file, so this covers every connection.
+    cur.execute("PRAGMA journal_mode=WAL")
+
     # Users
     cur.execute("""
         CREATE TABLE IF NOT EXISTS users (
@@ -62,10 +124,59 @@ def init_db():
         )
     """)
 
+    # call_worked -> DXCC entity, so band counts can be done in SQL
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS qso_entities (
+            call_worked TEXT PRIMARY KEY,
+            entity_id TEXT
+        )
+    """)
+
+    # QSO table / dashboard filters (lotw_users is keyed by callsign already)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_qsos_user_band
+        ON qsos (callsign, band)
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_qsos_user_qsl_band
+        ON qsos (callsign, qsl_status, band)
+    """)
+    # Lets the QSO table's ORDER BY qso_date DESC walk the index instead
+    # of sorting in a temp b-tree
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_qsos_user_date
+        ON qsos (callsign, qso_date)
+    """)
+
     con.commit()
     con.close()
 
 
+def write_connection():
+    """
+    Connection for bulk writes, which callers can pass to the con
+    parameter of the helpers below to share it across a whole import.
+    """
+    con = sqlite3.connect(DB_PATH)
+    # Safe with WAL - a crash can only lose the last batch, not corrupt
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+
+def analyze_qsos(con=None):
+    """
+    Refresh planner statistics after a bulk import so the
+    qsos indexes are picked up.
+    """
+    own = con is None
+    if own:
+        con = sqlite3.connect(DB_PATH)
+    con.execute("ANALYZE qsos")
+    con.commit()
+    if own:
+        con.close()
+
+
 # ------------------------------------------------------------
 # QSO helpers
 # ------------------------------------------------------------
@@ -90,6 +201,39 @@ def add_qso(user, country, call_worked, date, status, band):
     con.commit()
     con.close()
 
+    invalidate_dashboards()
+    sync_qso_entities()
+
+
+def add_qsos_bulk(user, records, con=None):
+    """
+    Insert many QSOs in a single transaction.
+    Used by ADIF import instead of one add_qso() commit per record.
+
+    records: iterable of (country, call_worked, date, status, band)
+    con: optional open connection (see write_connection())
+
+    Returns the number of rows inserted.
+    """
+    rows = []
+    for _country, call_worked, date, status, band in records:
+        eid, name, active = dxcc_prefixes.entity_for_callsign(call_worked)
+        prefix = dxcc_prefixes.prefix_for_callsign(call_worked) or ""
+        rows.append((user, name, prefix, call_worked, date, status, band))
+
+    own = con is None
+    if own:
+        con = write_connection()
+    with con:
+        con.executemany("""
+            INSERT INTO qsos VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+    if own:
+        con.close()
+
+    invalidate_dashboards()
+    return len(rows)
+
 
 def delete_qso(user, country, call_worked, date, status, band):
     con = sqlite3.connect(DB_PATH)
@@ -101,20 +245,35 @@ def delete_qso(user, country, call_worked, date, status, band):
     con.commit()
     con.close()
 
+    invalidate_dashboards()
+
 
 def get_qsos_for_user(user):
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    cur.execute("""
-        SELECT prefix, country, call_worked, qso_date, qsl_status, band
-        FROM qsos
-        WHERE callsign=?
-        ORDER BY band, prefix
-    """, (user,))
-    rows = cur.fetchall()
-    con.close()
+    with read_cursor() as cur:
+        cur.execute("""
+            SELECT prefix, country, call_worked, qso_date, qsl_status, band
+            FROM qsos
+            WHERE callsign=?
+            ORDER BY qso_date DESC
+        """, (user,))
+        rows = cur.fetchall()
     return rows
 
+def get_qso_keys(user):
+    """
+    (call_worked, qso_date, band) of every QSO a user already has.
+    Lets ADIF import check duplicates in memory - one query instead
+    of a qso_exists() round trip per record.
+    """
+    with read_cursor() as cur:
+        cur.execute("""
+            SELECT call_worked, qso_date, band
+            FROM qsos
+            WHERE callsign=?
+        """, (user,))
+        return set(cur.fetchall())
+
+
 def qso_exists(user, call_worked, date, band):
     """
     Check if a QSO already exists for a user.
@@ -144,10 +303,84 @@ def qso_exists(user, call_worked, date, band):
 
     return row[0] if row else None
 
+def sync_qso_entities(con=None):
+    """
+    Map every worked call that isn't in qso_entities yet.
+    entity_for_callsign() runs once per new call instead of on
+    every band dashboard refresh.
+    """
+    own = con is None
+    if own:
+        con = sqlite3.connect(DB_PATH)
+    with con:
+        calls = con.execute("""
+            SELECT DISTINCT q.call_worked
+            FROM qsos q
+            LEFT JOIN qso_entities e USING (call_worked)
+            WHERE e.call_worked IS NULL
+        """).fetchall()
+
+        con.executemany(
+            "INSERT OR REPLACE INTO qso_entities VALUES (?, ?)",
+            (
+                (call, dxcc_prefixes.entity_for_callsign(call)[0])
+                for (call,) in calls
+            ),
+        )
+    if own:
+        con.close()
+
+
+def clear_qso_entities():
+    """
+    Rebuild the call -> entity mapping after the prefix tables change.
+    Call it once the new prefix data is loaded - the calls are mapped
+    again straight away, in the same transaction as the delete, so the
+    band dashboard never sees an empty or half-filled table.
+    """
+    con = sqlite3.connect(DB_PATH)
+    with con:
+        con.execute("DELETE FROM qso_entities")
+        sync_qso_entities(con)
+    con.close()
+
+    invalidate_dashboards()
+
+
 # ------------------------------------------------------------
 # Dashboard logic
 # ------------------------------------------------------------
 
+# Dashboard results by arguments - QSOs only change through the helpers
+# above, which clear this via invalidate_dashboards(). Results are only
+# stored if no write happened while they were being read
+# (see _cache_dashboard()).
+_DASHBOARD_CACHE = {}
+
+# Bumped by invalidate_dashboards() on every QSO write and prefix table
+# reload; caches outside this module (the UI's QSO table views) compare
+# against it instead of each write path having to clear them
+_DATA_EPOCH = 0
+
+
+def invalidate_dashboards():
+    global _DATA_EPOCH
+    _DASHBOARD_CACHE.clear()
+    _DATA_EPOCH += 1
+
+
+def data_epoch():
+    return _DATA_EPOCH
+
+
+def _cache_dashboard(key, value, epoch):
+    # A write that committed after the query read its rows has already
+    # cleared the cache; storing now would keep the old counts until
+    # the next write
+    if data_epoch() == epoch:
+        _DASHBOARD_CACHE[key] = value
+
+
 # ============================================================
 # DASHBOARD (STABLE)
 # Relies on:
@@ -158,44 +391,131 @@ def qso_exists(user, call_worked, date, band):
 # ============================================================
 
 def get_dxcc_dashboard(user, bands, include_deleted):
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
+    key = (user, tuple(bands) if bands else None, include_deleted)
+    cached = _DASHBOARD_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    epoch = data_epoch()
+    with read_cursor() as cur:
+        if bands:
+            placeholders = ",".join("?" * len(bands))
+            cur.execute(f"""
+                SELECT call_worked, qsl_status, band
+                FROM qsos
+                WHERE callsign=? AND band IN ({placeholders})
+            """, (user, *bands))
+        else:
+            cur.execute("""
+                SELECT call_worked, qsl_status, band
+                FROM qsos
+                WHERE callsign=?
+            """, (user,))
+
+        rows = cur.fetchall()
+
+    worked, confirmed = _tally_worked_confirmed(
+        ((call, status) for call, status, band in rows),
+        include_deleted,
+    )
 
-    if bands:
-        placeholders = ",".join("?" * len(bands))
-        cur.execute(f"""
-            SELECT call_worked, qsl_status, band
-            FROM qsos
-            WHERE callsign=? AND band IN ({placeholders})
-        """, (user, *bands))
-    else:
+    total_active = dxcc_prefixes.TOTAL_ACTIVE
+
+    _cache_dashboard(key, (worked, confirmed, total_active), epoch)
+    return worked, confirmed, total_active
+
+
+def get_qsos_and_dashboard(user, bands, include_deleted):
+    """
+    Fetch a user's QSOs and the dashboard counts in one round trip.
+
+    Returns:
+        rows (list of (call_worked, qso_date, qsl_status, band, lotw_last_upload)),
+            newest first
+        worked, confirmed, total_active - same as get_dxcc_dashboard()
+
+    bands only limits the dashboard counts; every QSO is returned.
+    """
+    epoch = data_epoch()
+    with read_cursor() as cur:
         cur.execute("""
-            SELECT call_worked, qsl_status, band
-            FROM qsos
-            WHERE callsign=?
+            SELECT q.call_worked, q.qso_date, q.qsl_status, q.band,
+                   l.last_upload
+            FROM qsos q
+            LEFT JOIN lotw_users l ON l.callsign = UPPER(q.call_worked)
+            WHERE q.callsign=?
+            ORDER BY q.qso_date DESC
         """, (user,))
+        rows = cur.fetchall()
 
-    rows = cur.fetchall()
-    con.close()
+    tracked = set(bands) if bands else None
+
+    worked, confirmed = _tally_worked_confirmed(
+        (
+            (call, status)
+            for call, _date, status, band, _lotw in rows
+            if tracked is None or band in tracked
+        ),
+        include_deleted,
+    )
+
+    total_active = dxcc_prefixes.TOTAL_ACTIVE
+
+    key = (user, tuple(bands) if bands else None, include_deleted)
+    _cache_dashboard(key, (worked, confirmed, total_active), epoch)
+
+    return rows, worked, confirmed, total_active
+
+
+def get_band_dashboard(user, band):
+    """
+    (worked, confirmed) entity counts for a single band.
+    Only "Confirmed" counts as confirmed here, as on the band filter
+    in the UI.
+    """
+    key = (user, "band", band)
+    cached = _DASHBOARD_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    # qso_entities is kept up to date by the write paths (add_qso, ADIF
+    # import) and rebuilt by clear_qso_entities() on a prefix reload
+    epoch = data_epoch()
+    with read_cursor() as cur:
+        cur.execute("""
+            SELECT COUNT(DISTINCT e.entity_id),
+                   COUNT(DISTINCT CASE WHEN q.qsl_status='Confirmed'
+                                       THEN e.entity_id END)
+            FROM qsos q
+            JOIN qso_entities e USING (call_worked)
+            WHERE q.callsign=? AND q.band=?
+        """, (user, band))
+        counts = cur.fetchone()
+
+    _cache_dashboard(key, counts, epoch)
+    return counts
+
+
+def _tally_worked_confirmed(calls, include_deleted):
+    """
+    (call_worked, qsl_status) pairs -> (worked, confirmed) entity id sets
+    """
+    entity = dxcc_prefixes.entity_for_callsign
 
     worked = set()
     confirmed = set()
 
-    for call, status, band in rows:
-        eid, _, active = dxcc_prefixes.entity_for_callsign(call)
-        if not eid:
-            continue
-        if not include_deleted and not active:
+    # Logs repeat the same (call, status) many times - resolve each once
+    for call, status in set(calls):
+        eid, _, active = entity(call)
+        if not eid or not (include_deleted or active):
             continue
+
         worked.add(eid)
-        if status in ("Confirmed", "LoTW", "QSL"):
+        if status in CONFIRMED_STATUSES:
             confirmed.add(eid)
 
-    total_active = sum(
-        1 for e in dxcc_prefixes.DXCC_ENTITIES.values() if e["active"]
-    )
-
-    return worked, confirmed, total_active
+    return worked, confirmed
 
 def get_dxcc_counts(user: str):
     """
@@ -273,7 +593,7 @@ def get_dxcc_need_list(user, bands, include_deleted):
         if not include_deleted and not active:
             continue
         worked.add((eid, band))
-        if status in ("Confirmed", "LoTW", "QSL"):
+        if status in CONFIRMED_STATUSES:
             confirmed.add((eid, band))
 
     needs = []
@@ -346,7 +666,20 @@ def is_admin_user(callsign):
     return bool(row and row[0])
 
 
+# (active, total, prefixes) - only changes when the DXCC tables are reloaded
+_DXCC_STATS = None
+
+
 def get_dxcc_stats():
+    """
+    Returns (active, total, prefixes) DXCC counts.
+    Cached until invalidate_dxcc_stats() is called by a cache reload.
+    """
+    global _DXCC_STATS
+
+    if _DXCC_STATS is not None:
+        return _DXCC_STATS
+
     con = sqlite3.connect(DB_PATH)
     cur = con.cursor()
     cur.execute("SELECT COUNT(*) FROM dxcc_entities WHERE active=1")
@@ -356,7 +689,15 @@ def get_dxcc_stats():
     cur.execute("SELECT COUNT(*) FROM dxcc_prefixes")
     prefixes = cur.fetchone()[0]
     con.close()
-    return active, total, prefixes
+
+    _DXCC_STATS = (active, total, prefixes)
+    return _DXCC_STATS
+
+
+def invalidate_dxcc_stats():
+    global _DXCC_STATS
+    _DXCC_STATS = None
+
 
 def backfill_qso_countries():
     """
@@ -367,6 +708,8 @@ def backfill_qso_countries():
     from app import dxcc_prefixes
 
     dxcc_prefixes.load_dxcc_data(force_reload=True)
+    # Same as reload_dxcc_cache(): band counts follow the reloaded prefixes
+    clear_qso_entities()
 
     con = sqlite3.connect(DB_PATH)
     cur = con.cursor()
@@ -7,7 +7,10 @@ Fallback: DXCC entities (numeric IDs) from dxcc_entities/dxcc_prefixes tables
 This gives comprehensive coverage with user-friendly letter prefixes.
 """
 
+import functools
 import sqlite3
+import sys
+import threading
 from typing import Dict, List, Tuple, Optional
 
 from app.config import DB_PATH
@@ -19,6 +22,9 @@ from app.config import DB_PATH
 # entity_id -> {"name": str, "active": bool}
 DXCC_ENTITIES: Dict[str, Dict[str, object]] = {}
 
+# Number of active entries in DXCC_ENTITIES, counted at load time
+TOTAL_ACTIVE = 0
+
 # list of (prefix, entity_id), sorted longest-prefix first
 DXCC_PREFIX_RULES: List[Tuple[str, str]] = []
 
@@ -26,8 +32,20 @@ DXCC_PREFIX_RULES: List[Tuple[str, str]] = []
 CTY_ENTITIES: Dict[str, Dict[str, object]] = {}
 CTY_PREFIX_RULES: List[Tuple[str, str, bool]] = []  # (prefix, entity_id, exact_match)
 
+# Lookup indexes over the rule lists above, built at load time so a
+# callsign is resolved with one dict probe per prefix length instead of
+# a scan of every rule. Where a prefix appears more than once, the rule
+# that comes first in the list wins, as it did in the scan.
+_CTY_WHOLE: Dict[str, str] = {}    # any CTY rule, matched against the whole call
+_CTY_STARTS: Dict[str, str] = {}   # non-exact CTY rules, matched as a prefix
+_DXCC_STARTS: Dict[str, str] = {}
+
 _DXCC_LOADED = False
 
+# Every Flet session runs main() -> load_dxcc_data(); only the first one
+# should parse, even when several clients connect at the same moment.
+_LOAD_LOCK = threading.Lock()
+
 
 # ------------------------------------------------------------
 # Load DXCC data from SQLite (once)
@@ -39,15 +57,26 @@ def load_dxcc_data(force_reload: bool = False):
     Also loads CTY fallback data.
     Called once at app startup or manually via admin reload.
     """
-    global _DXCC_LOADED
-
     if _DXCC_LOADED and not force_reload:
         return
 
+    with _LOAD_LOCK:
+        # Another session may have finished loading while we waited
+        if _DXCC_LOADED and not force_reload:
+            return
+        _load_dxcc_data()
+
+
+def _load_dxcc_data():
+    global _DXCC_LOADED, TOTAL_ACTIVE
+
     DXCC_ENTITIES.clear()
     DXCC_PREFIX_RULES.clear()
     CTY_ENTITIES.clear()
     CTY_PREFIX_RULES.clear()
+    _CTY_WHOLE.clear()
+    _CTY_STARTS.clear()
+    _DXCC_STARTS.clear()
 
     con = sqlite3.connect(DB_PATH)
     cur = con.cursor()
@@ -60,10 +89,11 @@ def load_dxcc_data(force_reload: bool = False):
             "active": bool(active),
         }
 
-    # Load DXCC prefixes
+    # Load DXCC prefixes. An entity owns many prefixes; interning its id
+    # keeps one string per entity instead of one per rule.
     cur.execute("SELECT prefix, entity_id FROM dxcc_prefixes")
     for prefix, entity_id in cur.fetchall():
-        DXCC_PREFIX_RULES.append((prefix.upper(), str(entity_id)))
+        DXCC_PREFIX_RULES.append((prefix.upper(), sys.intern(str(entity_id))))
 
     # Load CTY entities (fallback)
     try:
@@ -81,7 +111,9 @@ def load_dxcc_data(force_reload: bool = False):
     try:
         cur.execute("SELECT prefix, entity_id, exact_match FROM cty_prefixes")
         for prefix, entity_id, exact_match in cur.fetchall():
-            CTY_PREFIX_RULES.append((prefix.upper(), str(entity_id), bool(exact_match)))
+            CTY_PREFIX_RULES.append(
+                (prefix.upper(), sys.intern(str(entity_id)), bool(exact_match))
+            )
     except sqlite3.OperationalError:
         # CTY tables don't exist yet
         pass
@@ -92,11 +124,23 @@ def load_dxcc_data(force_reload: bool = False):
     DXCC_PREFIX_RULES.sort(key=lambda r: len(r[0]), reverse=True)
     CTY_PREFIX_RULES.sort(key=lambda r: len(r[0]), reverse=True)
 
+    for prefix, entity_id, exact_match in CTY_PREFIX_RULES:
+        _CTY_WHOLE.setdefault(prefix, entity_id)
+        if not exact_match:
+            _CTY_STARTS.setdefault(prefix, entity_id)
+    for prefix, entity_id in DXCC_PREFIX_RULES:
+        _DXCC_STARTS.setdefault(prefix, entity_id)
+
+    # Cached lookups were resolved against the old rules
+    entity_for_callsign.cache_clear()
+    prefix_for_callsign.cache_clear()
+
+    TOTAL_ACTIVE = sum(1 for e in DXCC_ENTITIES.values() if e["active"])
     _DXCC_LOADED = True
 
     print(
         f"DXCC cache loaded: "
-        f"{sum(1 for e in DXCC_ENTITIES.values() if e['active'])} active / "
+        f"{TOTAL_ACTIVE} active / "
         f"{len(DXCC_ENTITIES)} total"
     )
     
@@ -113,15 +157,45 @@ def reload_dxcc_cache():
     Force reload DXCC data from SQLite.
     Intended for admin-only use.
     """
+    from app.database import clear_qso_entities, invalidate_dxcc_stats
+
     global _DXCC_LOADED
     _DXCC_LOADED = False
+    invalidate_dxcc_stats()
     load_dxcc_data(force_reload=True)
+    # Remaps every worked call, so it has to follow the load
+    clear_qso_entities()
 
 
 # ------------------------------------------------------------
 # Prefix / entity resolution with CTY fallback
 # ------------------------------------------------------------
 
+def _longest_match(call: str) -> Optional[Tuple[str, str]]:
+    """
+    (prefix, entity_id) of the longest rule matching an upper-cased
+    callsign - CTY first, then DXCC - or None.
+    """
+    # Try CTY first (gives us letter prefixes like "K", "VE").
+    # Exact-match rules only ever match the whole callsign.
+    entity_id = _CTY_WHOLE.get(call)
+    if entity_id is not None:
+        return call, entity_id
+
+    for end in range(len(call) - 1, -1, -1):
+        entity_id = _CTY_STARTS.get(call[:end])
+        if entity_id is not None:
+            return call[:end], entity_id
+
+    # Fallback to DXCC (numeric entity IDs)
+    for end in range(len(call), -1, -1):
+        entity_id = _DXCC_STARTS.get(call[:end])
+        if entity_id is not None:
+            return call[:end], entity_id
+
+    return None
+
+
 def resolve_callsign(call: str) -> Optional[str]:
     """
     Resolve a callsign to entity_id using longest-prefix match.
@@ -131,27 +205,11 @@ def resolve_callsign(call: str) -> Optional[str]:
     if not call:
         return None
 
-    call = call.upper()
-
-    # Try CTY first (gives us letter prefixes like "K", "VE")
-    for prefix, entity_id, exact_match in CTY_PREFIX_RULES:
-        if exact_match:
-            # Exact callsign match
-            if call == prefix:
-                return entity_id
-        else:
-            # Prefix match
-            if call.startswith(prefix):
-                return entity_id
-
-    # Fallback to DXCC (numeric entity IDs)
-    for prefix, entity_id in DXCC_PREFIX_RULES:
-        if call.startswith(prefix):
-            return entity_id
-
-    return None
+    match = _longest_match(call.upper())
+    return match[1] if match else None
 
 
+@functools.lru_cache(maxsize=8192)
 def entity_for_callsign(call: str) -> Tuple[Optional[str], str, bool]:
     """
     Resolve callsign to:
@@ -159,6 +217,9 @@ def entity_for_callsign(call: str) -> Tuple[Optional[str], str, bool]:
 
     If no match is found:
         (None, "Unknown", False)
+
+    Logs repeat the same calls a lot, so results are memoized;
+    the cache is cleared whenever the prefix tables are reloaded.
     """
     entity_id = resolve_callsign(call)
 
@@ -178,28 +239,16 @@ def entity_for_callsign(call: str) -> Tuple[Optional[str], str, bool]:
     return entity_id, "Unknown", False
 
 
+@functools.lru_cache(maxsize=8192)
 def prefix_for_callsign(call: str) -> str | None:
     """
     Return the longest matching prefix for a callsign.
     Tries CTY first (letter prefixes), then falls back to DXCC.
+
+    Memoized like entity_for_callsign().
     """
     if not call:
         return None
 
-    call = call.upper()
-
-    # Try CTY first (letter prefixes)
-    for prefix, _entity_id, exact_match in CTY_PREFIX_RULES:
-        if exact_match:
-            if call == prefix:
-                return prefix
-        else:
-            if call.startswith(prefix):
-                return prefix
-
-    # Fallback to DXCC
-    for prefix, _entity_id in DXCC_PREFIX_RULES:
-        if call.startswith(prefix):
-            return prefix
-
-    return None
\ No newline at end of file
+    match = _longest_match(call.upper())
+    return match[0] if match else None
\ No newline at end of file
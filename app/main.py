@@ -11,12 +11,13 @@ BUILD_DATE = "2025-12-13"
 
 from datetime import datetime, UTC, timedelta
 from collections import defaultdict
+from operator import itemgetter
 
 import flet as ft
 
 import os
+import sys
 import tempfile
-import sqlite3
 import threading
 
 IS_WEB = os.environ.get("FLET_PLATFORM") == "web"
@@ -30,20 +31,22 @@ from app.database import (
     get_qsos_for_user,
     get_user_profile,
     get_dxcc_dashboard,
+    get_band_dashboard,
+    get_qsos_and_dashboard,
     get_dxcc_need_list,
     is_admin_user,
     get_dxcc_stats,
     get_dxcc_counts,
+    read_cursor,
+    data_epoch,
 )
 
 from app.adif_import import import_adif
 
-from app.lotw_cache import refresh_lotw_cache, get_lotw_last_upload
+from app.lotw_cache import refresh_lotw_cache
 
 from app import dxcc_prefixes
 
-from app.config import DB_PATH
-
 from app.cty_import import update_cty_data, get_last_cty_update
 
 
@@ -56,8 +59,59 @@ ALL_BANDS = [
     "6m",
 ]
 
+QSL_FILTER_OPTIONS = ["All", "Confirmed", "Requested", "Not Requested"]
+
 LOTW_GREEN_DAYS = 90
 
+# Wait this long after the last keystroke before re-querying
+SEARCH_DEBOUNCE_SECS = 0.25
+
+# Dropdown / sort changes - just enough to fold repeated events into one
+FILTER_DEBOUNCE_SECS = 0.05
+
+# QSO table windowing: DataRows are built this many at a time, and the
+# next batch is appended once the user scrolls within the margin (px)
+QSO_PAGE_SIZE = 200
+QSO_SCROLL_MARGIN = 600
+
+# Filter combinations whose rows are kept for switching back and forth
+QSO_VIEW_CACHE_SIZE = 8
+
+# QSO table query, one fixed statement per set of active filters, keyed
+# by (qsl, band, search) on/off. Filters are left out rather than written
+# as "(:band = 'All' OR q.band = :band)" - SQLite can't use the
+# (callsign, band) / (callsign, qsl_status, band) indexes for that form.
+# There are only eight, so sqlite3's statement cache keeps them all
+# prepared.
+_QSO_TABLE_FILTERS = (
+    "q.qsl_status = :qsl",
+    "q.band = :band",
+    "UPPER(q.call_worked) LIKE :search",
+)
+
+
+def _qso_table_sql(active):
+    where = " AND ".join(
+        ["q.callsign = :user"]
+        + [cond for cond, on in zip(_QSO_TABLE_FILTERS, active) if on]
+    )
+    return f"""
+    SELECT q.call_worked, q.qso_date, q.qsl_status, q.band,
+           l.last_upload
+    FROM qsos q
+    LEFT JOIN lotw_users l ON l.callsign = UPPER(q.call_worked)
+    WHERE {where}
+    ORDER BY q.qso_date DESC
+"""
+
+
+QSO_TABLE_SQL = {
+    (qsl, band, search): _qso_table_sql((qsl, band, search))
+    for qsl in (False, True)
+    for band in (False, True)
+    for search in (False, True)
+}
+
 COUNTRY_ABBREVIATIONS = {
     "International Telecommunication Union Headquarters": "ITU HQ",
     "United States of America": "USA",
@@ -65,6 +119,146 @@ COUNTRY_ABBREVIATIONS = {
     # Add more as you encounter them
 }
 
+# ------------------------------------------------------------
+# UI builders
+# Controls whose shape never changes between logins. main() builds
+# each one once per session and show_app() reuses it on re-entry.
+# ------------------------------------------------------------
+def _build_band_filter():
+    return ft.Dropdown(
+        options=[ft.dropdown.Option(b) for b in ["All", *ALL_BANDS]],
+        value="All",
+        width=100,
+        #height=40,
+        text_size=12,
+    )
+
+
+def _build_qsl_filter():
+    return ft.Dropdown(
+        label="Filter by QSL Status",
+        options=[ft.dropdown.Option(s) for s in QSL_FILTER_OPTIONS],
+        value="All",
+        width=200,
+    )
+
+
+def _build_qso_table(band_filter):
+    return ft.DataTable(
+        columns=[
+            ft.DataColumn(ft.Text("Prefix")),
+            ft.DataColumn(
+                ft.Text(
+                    "Country",
+                    text_align=ft.TextAlign.CENTER,
+                )
+            ),
+            ft.DataColumn(ft.Text("Call")),
+            ft.DataColumn(
+                ft.Text(
+                    "QSO\nDate",  # Line break for two rows
+                )
+            ),
+            ft.DataColumn(
+                ft.Text(
+                    "QSL\nStatus",  # Could also make this two rows for consistency
+                )
+            ),
+            ft.DataColumn(
+                ft.Text(
+                    "LoTW\nDate",  # Makes it explicit
+                    text_align=ft.TextAlign.CENTER,
+                )
+            ),
+            #Column(ft.Text("Band")),
+            ft.DataColumn(
+                ft.Column(
+                    [
+                        ft.Text("Band", size=12),
+                        band_filter,
+                    ],
+                    spacing=2,
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                )
+            ),
+        ],
+        rows=[],
+        column_spacing=10,
+        horizontal_lines=ft.BorderSide(1, ft.Colors.GREY_800),
+        heading_row_height=80,  # Taller header to accommodate two lines
+        sort_column_index=None,
+        sort_ascending=True,
+    )
+
+
+def _build_need_table():
+    return ft.DataTable(
+        columns=[
+            ft.DataColumn(ft.Text("Prefix")),
+            ft.DataColumn(ft.Text("Country")),
+            ft.DataColumn(ft.Text("Band")),
+        ],
+        rows=[],
+    )
+
+
+def _stat_box(label, value_control, color):
+    return ft.Container(
+        content=ft.Column(
+            [
+                ft.Text(label, size=14),
+                value_control,
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        ),
+        padding=16,
+        bgcolor=color,
+        border_radius=10,
+        width=180,
+    )
+
+
+def _build_dashboard():
+    """
+    Returns (dashboard_row, worked_txt, confirmed_txt, remaining_txt)
+    """
+    worked_txt = ft.Text(size=26, weight="bold")
+    confirmed_txt = ft.Text(size=26, weight="bold")
+    remaining_txt = ft.Text(size=26, weight="bold")
+
+    dashboard = ft.Row(
+        [
+            _stat_box("Worked", worked_txt, ft.Colors.BLUE_GREY_800),
+            _stat_box("Confirmed", confirmed_txt, ft.Colors.GREEN_800),
+            _stat_box("Unconfirmed", remaining_txt, ft.Colors.ORANGE_800),
+        ],
+        spacing=20,
+    )
+
+    return dashboard, worked_txt, confirmed_txt, remaining_txt
+
+
+def _build_footer():
+    return ft.Container(
+        content=ft.Row(
+            [
+                ft.Text(
+                    f"DXCC Need List Tracker • v{APP_VERSION} • Build {BUILD_DATE}",
+                    size=12,
+                    color=ft.Colors.GREY_500,
+                ),
+                ft.Text(
+                    "© N4LR",
+                    size=12,
+                    color=ft.Colors.GREY_500,
+                ),
+            ],
+            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+        ),
+        padding=10,
+    )
+
+
 # ------------------------------------------------------------
 # App entry
 # ------------------------------------------------------------
@@ -77,40 +271,100 @@ def main(page: ft.Page):
     init_db()
     dxcc_prefixes.load_dxcc_data()
 
-    current_user = {"callsign": None}
+    current_user = {"callsign": None, "is_admin": False}
+
+    ui_cache = {}
+
+    def cached_control(key, build):
+        if key not in ui_cache:
+            ui_cache[key] = build()
+        return ui_cache[key]
+
+    # Cached controls are shared by every login on this page. Each
+    # show_app() takes the current token; show_login() moves it on, so
+    # refreshes still running for the previous user stop rendering into
+    # them. The lock makes the token check and the render one step.
+    app_session = {"token": 0, "lock": threading.Lock(), "view_timer": None}
+
+    # Overlay controls outlive show_app(), so the ADIF file picker is added
+    # once here and show_app() only points its on_result at the current view
+    picker = ft.FilePicker()
+    page.overlay.append(picker)
 
     # -------------------------
     # LOGIN VIEW
     # -------------------------
-    def show_login():
-        page.controls.clear()
+    # Both views stay on the page for the whole session; logging in or out
+    # only flips which one is visible. show_app() refills app_view per user.
+    callsign_input = ft.TextField(label="Callsign", autofocus=True, width=300)
+    password_input = ft.TextField(label="Password", password=True, width=300)
+    login_status = ft.Text(color=ft.Colors.RED)
 
-        callsign_input = ft.TextField(label="Callsign", autofocus=True, width=300)
-        password_input = ft.TextField(label="Password", password=True, width=300)
-        status = ft.Text(color=ft.Colors.RED)
+    def on_login(e):
+        # Password check and the first app render run on a worker
+        # thread; the disabled button also stops double submits
+        login_btn.disabled = True
+        login_btn.text = "Signing in…"
+        login_status.value = ""
+        page.update()
 
-        def on_login(e):
-            ok, msg = authenticate(callsign_input.value, password_input.value)
-            if not ok:
-                status.value = msg
-                page.update()
-                return
+        def login_failed(msg):
+            login_status.value = msg
+            login_btn.disabled = False
+            login_btn.text = "Login"
+            page.update()
 
-            current_user["callsign"] = callsign_input.value.upper()
-            show_app()
+        def do_login():
+            # Nothing else would report an error raised on this thread -
+            # the button would just stay at "Signing in…"
+            try:
+                ok, msg = authenticate(callsign_input.value, password_input.value)
+                if not ok:
+                    login_failed(msg)
+                    return
 
-        page.add(
-            ft.Column(
-                [
-                    ft.Text("DXCC Tracker", size=24, weight="bold"),
-                    callsign_input,
-                    password_input,
-                    ft.ElevatedButton("Login", on_click=on_login),
-                    status,
-                ],
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            )
-        )
+                current_user["callsign"] = callsign_input.value.strip().upper()
+                # Admin flag is constant for the session - look it up once
+                current_user["is_admin"] = is_admin_user(current_user["callsign"])
+                show_app()
+            except Exception as ex:
+                current_user["callsign"] = None
+                current_user["is_admin"] = False
+                login_failed(f"Login failed: {ex}")
+
+        threading.Thread(target=do_login, daemon=True).start()
+
+    login_btn = ft.ElevatedButton("Login", on_click=on_login)
+
+    login_view = ft.Column(
+        [
+            ft.Text("DXCC Tracker", size=24, weight="bold"),
+            callsign_input,
+            password_input,
+            login_btn,
+            login_status,
+        ],
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+    )
+    app_view = ft.Column(spacing=16, visible=False)
+
+    page.add(login_view, app_view)
+
+    def show_login():
+        with app_session["lock"]:
+            app_session["token"] += 1
+            view_timer = app_session["view_timer"]
+            if view_timer and view_timer["timer"]:
+                view_timer["timer"].cancel()
+
+        password_input.value = ""
+        login_status.value = ""
+        login_btn.disabled = False
+        login_btn.text = "Login"
+
+        app_view.visible = False
+        app_view.controls.clear()  # drop the last user's view
+        login_view.visible = True
         page.update()
 
     # -------------------------
@@ -118,18 +372,19 @@ def main(page: ft.Page):
     # -------------------------
     def do_logout(e=None):
         current_user["callsign"] = None
+        current_user["is_admin"] = False
         show_login()
 
     # -------------------------
     # MAIN APP
     # -------------------------
     def show_app():
-        page.controls.clear()
-
         user = current_user["callsign"]
         if not user:
             show_login()
             return
+
+        token = app_session["token"]
             
         track_all, bands, include_deleted = get_user_profile(user)
         
@@ -137,7 +392,8 @@ def main(page: ft.Page):
         def on_sort_prefix(e):
             sort_column["ascending"] = not sort_column["ascending"] if sort_column["name"] == "prefix" else True
             sort_column["name"] = "prefix"
-            refresh_qso_table()
+            # sorting doesn't change the counts
+            schedule_view(FILTER_DEBOUNCE_SECS, dashboard=False)
         
         # File picker for ADIF import
         def on_file_picked(e: ft.FilePickerResultEvent):
@@ -152,10 +408,26 @@ def main(page: ft.Page):
             
             # Run import in background
             #import threading
+            import_user = current_user["callsign"]
+
+            # Only whole-percent steps are sent, not one update per record
+            progress = {"percent": -1}
+
+            def on_progress(percent, message):
+                if percent == progress["percent"]:
+                    return
+                progress["percent"] = percent
+                import_progress.value = percent / 100
+                import_status.value = message
+                page.update(import_progress, import_status)
+
             def do_import():
+                # Parsing and the inserts stay on this thread; page updates
+                # are safe from here, so on_done is called directly
+                # (page.run_task expects a coroutine)
                 try:
-                    result = import_adif(file_path, user)
-                    page.run_task(lambda: on_done(result))
+                    result = import_adif(file_path, import_user, on_progress=on_progress)
+                    on_done(result)
                 except Exception as ex:
                     import_status.value = f"Import failed: {str(ex)}"
                     import_progress.visible = False
@@ -163,109 +435,93 @@ def main(page: ft.Page):
             
             threading.Thread(target=do_import, daemon=True).start()
         
-        picker = ft.FilePicker(on_result=on_file_picked)
-        page.overlay.append(picker)
+        picker.on_result = on_file_picked
         
         # Progress indicator controls
         import_progress = ft.ProgressBar(visible=False, width=400)
         import_status = ft.Text("")
         
-        # Create band filter dropdown
-        band_filter = ft.Dropdown(
-            options=[
-                ft.dropdown.Option("All"),
-                ft.dropdown.Option("160m"),
-                ft.dropdown.Option("80m"),
-                ft.dropdown.Option("60m"),
-                ft.dropdown.Option("40m"),
-                ft.dropdown.Option("30m"),
-                ft.dropdown.Option("20m"),
-                ft.dropdown.Option("17m"),
-                ft.dropdown.Option("15m"),
-                ft.dropdown.Option("12m"),
-                ft.dropdown.Option("10m"),
-                ft.dropdown.Option("6m"),
-            ],
-            value="All",
-            width=100,
-            #height=40,
-            text_size=12,
-            on_change=lambda e: (refresh_qso_table(), refresh_dashboard()), # add refresh_dashboard 12/19/2025
-        )
-        
-        # Callsign search field
+        # Filter, sort and search changes are debounced so a burst of
+        # events runs one refresh
+        view_timer = {"timer": None, "dashboard": False}
+        app_session["view_timer"] = view_timer  # cancelled on logout
+
+        def schedule_view(delay, dashboard=True):
+            if view_timer["timer"]:
+                view_timer["timer"].cancel()
+            # Coalesced events refresh the counts if any of them needed it
+            view_timer["dashboard"] = view_timer["dashboard"] or dashboard
+
+            def fire():
+                needs_dashboard = view_timer["dashboard"]
+                view_timer["dashboard"] = False
+                refresh_view(dashboard=needs_dashboard)
+
+            view_timer["timer"] = threading.Timer(delay, fire)
+            view_timer["timer"].daemon = True
+            view_timer["timer"].start()
+
+        def on_filter_change(e):
+            schedule_view(FILTER_DEBOUNCE_SECS)
+
+        def on_search_change(e):
+            schedule_view(SEARCH_DEBOUNCE_SECS)
+
+        # Band filter lives in the QSO table header; both are reused across
+        # logins, so only the handlers are (re)wired here
+        band_filter = cached_control("band_filter", _build_band_filter)
+        band_filter.value = "All"
+        band_filter.on_change = on_filter_change
+
         callsign_search = ft.TextField(
             label="Search Callsign",
             hint_text="Type to filter...",
             width=200,
-            on_change=lambda e: refresh_qso_table(),
-        )
-        
-        qso_table = ft.DataTable(
-            columns=[
-                ft.DataColumn(ft.Text("Prefix"), on_sort=on_sort_prefix),
-                ft.DataColumn(
-                    ft.Text(
-                        "Country",
-                        text_align=ft.TextAlign.CENTER,
-                    )
-                ),
-                ft.DataColumn(ft.Text("Call")),
-                ft.DataColumn(
-                    ft.Text(
-                        "QSO\nDate",  # Line break for two rows
-                    )
-                ),
-                ft.DataColumn(
-                    ft.Text(
-                        "QSL\nStatus",  # Could also make this two rows for consistency
-                    )
-                ),
-                ft.DataColumn(
-                    ft.Text(
-                        "LoTW\nDate",  # Makes it explicit
-                        text_align=ft.TextAlign.CENTER,
-                    )
-                ),
-                #Column(ft.Text("Band")),
-                ft.DataColumn(
-                    ft.Column(
-                        [
-                            ft.Text("Band", size=12),
-                            band_filter,
-                        ],
-                        spacing=2,
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                    )
-                ),
-            ],
-            rows=[],
-            column_spacing=10,
-            horizontal_lines=ft.BorderSide(1, ft.Colors.GREY_800),
-            heading_row_height=80,  # Taller header to accommodate two lines
-            sort_column_index=None,
-            sort_ascending=True,
+            on_change=on_search_change,
         )
         
+        qso_table = cached_control("qso_table", lambda: _build_qso_table(band_filter))
+        qso_table.columns[0].on_sort = on_sort_prefix
+        qso_table.rows = []
+        qso_table.sort_column_index = None
+
+        # Full filtered/sorted result of the last refresh, and how much of
+        # it has been turned into DataRows so far
+        qso_view = {
+            "data_rows": [],
+            "rendered": 0,
+            "generation": 0,  # bumped per refresh; stale fetches are dropped
+            "lock": threading.Lock(),
+            # filters -> {sort: rows} for recently used filter combinations,
+            # so switching back doesn't go to SQLite or re-sort; None holds
+            # the newest-first rows. Dropped whenever data_epoch() moves
+            # (any QSO write or prefix reload) and after a LoTW refresh.
+            "views": {},
+            "epoch": None,
+            # (row tuple, occurrence) -> DataRow, reused across refreshes
+            "row_cache": {},
+            # DataRows dropped from the table, refilled for new QSOs
+            "row_pool": [],
+            # Other controls to send with the next rendered refresh
+            "also_update": [],
+        }
+
         sort_column = {"name": None, "ascending": True}
-        
-        need_table = ft.DataTable(
-            columns=[
-                ft.DataColumn(ft.Text("Prefix")),
-                ft.DataColumn(ft.Text("Country")),
-                ft.DataColumn(ft.Text("Band")),
-            ],
-            rows=[],
-        )
-               
+
+        need_table = cached_control("need_table", _build_need_table)
+        need_table.rows = []
+
         qso_tabs = ft.Tabs(
             tabs=[
                 ft.Tab(
                     "QSOs",
-                    ft.Column(
-                        [qso_table],
-                        scroll=ft.ScrollMode.AUTO,
+                    # ListView only lays out what is near the viewport
+                    ft.ListView(
+                        controls=[qso_table],
                         expand=True,
+                        cache_extent=500,
+                        on_scroll=lambda e: on_qso_scroll(e),
+                        on_scroll_interval=100,
                     ),
                 ),
                ft.Tab(
@@ -284,29 +540,21 @@ def main(page: ft.Page):
         # Admin Panel
         # -----------------------------
         def admin_panel():
-            active, total, prefixes = get_dxcc_stats()
-            cty_last_update = get_last_cty_update()
-
-            stats_txt = ft.Text(
-                f"DXCC Entities\n"
-                f"Active: {active}\n"
-                f"Total: {total}\n"
-                f"Prefixes: {prefixes}\n\n"
-                f"CTY.DAT Last Update:\n{cty_last_update}",
-                selectable=True,
-            )
+            def stats_text():
+                active, total, prefixes = get_dxcc_stats()
+                return (
+                    f"DXCC Entities\n"
+                    f"Active: {active}\n"
+                    f"Total: {total}\n"
+                    f"Prefixes: {prefixes}\n\n"
+                    f"CTY.DAT Last Update:\n{get_last_cty_update()}"
+                )
+
+            stats_txt = ft.Text(stats_text(), selectable=True)
 
             def reload_dxcc(e):
                 dxcc_prefixes.reload_dxcc_cache()
-                a, t, p = get_dxcc_stats()
-                cty_update = get_last_cty_update()
-                stats_txt.value = (
-                    f"DXCC Entities\n"
-                    f"Active: {a}\n"
-                    f"Total: {t}\n"
-                    f"Prefixes: {p}\n\n"
-                    f"CTY_DAT Last Update:\n{cty_update}"
-                )
+                stats_txt.value = stats_text()
                 page.snack_bar = ft.SnackBar(
                     ft.Text("DXCC cache reloaded"),
                     open=True,
@@ -314,13 +562,29 @@ def main(page: ft.Page):
                 page.update()
 
             def refresh_lotw(e):
-                refresh_lotw_cache(force=True)
+                # One large CSV download + bulk insert - keep it off the
+                # handler so the rest of the UI stays usable meanwhile
+                e.control.disabled = True
                 page.snack_bar = ft.SnackBar(
-                    ft.Text("LoTW cache refreshed"),
+                    ft.Text("Refreshing LoTW cache..."),
                     open=True,
                 )
                 page.update()
 
+                def do_refresh():
+                    try:
+                        refresh_lotw_cache(force=True)
+                        qso_view["views"].clear()  # LoTW dates changed
+                        msg = "LoTW cache refreshed"
+                    except Exception as ex:
+                        msg = f"LoTW refresh failed: {ex}"
+
+                    e.control.disabled = False
+                    page.snack_bar = ft.SnackBar(ft.Text(msg), open=True)
+                    page.update()
+
+                threading.Thread(target=do_refresh, daemon=True).start()
+
             def update_cty(e):
                 page.snack_bar = ft.SnackBar(
                     ft.Text("Downloading CTY.DAT..."),
@@ -333,16 +597,7 @@ def main(page: ft.Page):
                 if result['success']:
                     # Reload the cache to pick up new data
                     dxcc_prefixes.reload_dxcc_cache()
-            
-                    a, t, p = get_dxcc_stats()    # <-- ADD THIS LINE
-                    cty_update = get_last_cty_update()
-                    stats_txt.value = (
-                        f"DXCC Entities\n"
-                        f"Active: {a}\n"
-                        f"Total: {t}\n"
-                        f"Prefixes: {p}\n\n"
-                        f"CTY.DAT Last Update:\n{cty_update}"
-                    )
+                    stats_txt.value = stats_text()
             
                     page.snack_bar = ft.SnackBar(
                         ft.Text(f"CTY.DAT updated! {result['entities']} entities, {result['prefixes']} prefixes"),
@@ -389,35 +644,10 @@ def main(page: ft.Page):
                 border_radius=10,
             )
 
-        def stat_box(label, value_control, color):
-            return ft.Container(
-                content=ft.Column(
-                    [
-                        ft.Text(label, size=14),
-                        value_control,
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                ),
-                padding=16,
-                bgcolor=color,
-                border_radius=10,
-                width=180,
-            )
-
-        worked_txt = ft.Text(size=26, weight="bold")
-        confirmed_txt = ft.Text(size=26, weight="bold")
-        remaining_txt = ft.Text(size=26, weight="bold")
-
-
-        dashboard = ft.Row(
-            [
-                stat_box("Worked", worked_txt, ft.Colors.BLUE_GREY_800),
-                stat_box("Confirmed", confirmed_txt, ft.Colors.GREEN_800),
-                stat_box("Unconfirmed", remaining_txt, ft.Colors.ORANGE_800),
-            ],
-            spacing=20,
+        dashboard, worked_txt, confirmed_txt, remaining_txt = cached_control(
+            "dashboard", _build_dashboard
         )
-        
+
         def on_done(result=None):
             import_progress.visible = False
 
@@ -431,117 +661,249 @@ def main(page: ft.Page):
             else:
                 import_status.value = "✓ Import complete"
 
-            refresh_qso_table()
-            refresh_dashboard()
-            page.update()
+            # Sent along with the refreshed table and counts; the import's
+            # writes moved data_epoch(), so cached views are dropped
+            refresh_view(also_update=(import_status, import_progress))
 
-        def refresh_qso_table():
-            con = sqlite3.connect(DB_PATH)
-            cur = con.cursor()
-
-            # Build WHERE clause with QSL filter
-            where_clause = "WHERE callsign=?"
-            params = [user]
-    
-            # Add QSL status filter if not "All"
-            if qsl_filter_dropdown.value != "All":
-                where_clause += " AND qsl_status=?"
-                params.append(qsl_filter_dropdown.value)
-                
-            # Add Band filter if not "All"
-            if band_filter.value != "All":
-                where_clause += " AND band=?"
-                params.append(band_filter.value)
-                
-            # Add callsign search filter
-            if callsign_search.value and callsign_search.value.strip():
-                where_clause += " AND UPPER(call_worked) LIKE ?"
-                params.append(f"%{callsign_search.value.strip().upper()}%")
+        def refresh_view(dashboard=True, also_update=()):
+            # QSO table (and dashboard counts) are computed on a worker
+            # thread so filter changes don't block the UI, then sent in a
+            # single update of just the controls that changed; only the
+            # newest refresh renders
+            with qso_view["lock"]:
+                qso_view["generation"] += 1
+                generation = qso_view["generation"]
+                qso_view["also_update"].extend(also_update)
 
-            # Build ORDER BY clause based on sort state
-            order_by = "qso_date DESC"  # Default
-            if sort_column["name"] == "prefix":
-                order_by = f"call_worked {'ASC' if sort_column['ascending'] else 'DESC'}"
-    
-            cur.execute(
-                f"""
-                SELECT call_worked, qso_date, qsl_status, band
-                FROM qsos
-                {where_clause}
-                 ORDER BY {order_by}
-                """,
-                tuple(params),
-             )
-
-            rows = cur.fetchall()
-            qso_table.rows.clear()
-            page.update()
+            def do_refresh():
+                data_rows = fetch_qso_rows()
+                counts = dashboard_counts() if dashboard else None
+
+                with app_session["lock"]:
+                    # Logged out (maybe someone else logged in) meanwhile
+                    if app_session["token"] != token:
+                        return
+                    if not show_qso_rows(data_rows, generation):
+                        return
+
+                    with qso_view["lock"]:
+                        changed = [qso_table, *qso_view["also_update"]]
+                        qso_view["also_update"].clear()
+
+                    if counts and show_dashboard(*counts):
+                        changed += [worked_txt, confirmed_txt, remaining_txt]
+
+                page.update(*changed)
+
+            threading.Thread(target=do_refresh, daemon=True).start()
+
+        def fetch_qso_rows():
+            # Callsign search is a substring match
+            search = (callsign_search.value or "").strip().upper()
+
+            params = {
+                "user": user,
+                "qsl": qsl_filter_dropdown.value,
+                "band": band_filter.value,
+                "search": f"%{search}%" if search else "",
+            }
+
+            views = qso_view["views"]
+            filters = tuple(params.values())
+
+            # Views are only good for the data they were read from - QSOs
+            # can also arrive through the upload API or another session,
+            # and a DXCC / CTY reload changes every prefix
+            epoch = data_epoch()
+            with qso_view["lock"]:
+                if qso_view["epoch"] != epoch:
+                    views.clear()
+                    qso_view["epoch"] = epoch
+
+            view = views.get(filters)
+            if view is None:
+                with read_cursor() as cur:
+                    # "All" / "" switch the QSL, band and search filters off
+                    sql = QSO_TABLE_SQL[
+                        params["qsl"] != "All",
+                        params["band"] != "All",
+                        bool(params["search"]),
+                    ]
+                    cur.execute(sql, params)
+                    rows = cur.fetchall()
+
+                view = {None: build_qso_rows(rows)}
+
+                # Dicts keep insertion order - drop the oldest combination
+                with qso_view["lock"]:
+                    if len(views) >= QSO_VIEW_CACHE_SIZE:
+                        del views[next(iter(views))]
+                    views[filters] = view
+
+            sort = (
+                (sort_column["name"], sort_column["ascending"])
+                if sort_column["name"] else None
+            )
+            if sort not in view:
+                view[sort] = sort_qso_rows(view[None])
+
+            return view[sort]
+
+        def build_qso_rows(rows):
+            # LoTW dates are ISO YYYY-MM-DD, so staleness is a string compare
+            lotw_cutoff = (
+                datetime.now(UTC) - timedelta(days=LOTW_GREEN_DAYS)
+            ).date().isoformat()
+
+            # Logs repeat a few hundred countries at most - work out each
+            # one's (display, full) names once
+            country_names = {}
 
-            # Sort in Python by prefix if needed (since prefix isn't in DB)
             data_rows = []
-            for call, qso_date, qsl_status, band in rows:
+            for call, qso_date, qsl_status, band, lotw_date in rows:
+                # sqlite3 hands back a new str per row; status and band only
+                # have a handful of values, so cached views share them
+                if qsl_status:
+                    qsl_status = sys.intern(qsl_status)
+                if band:
+                    band = sys.intern(band)
+
+                # qsos.call_worked is nullable; the prefix sort compares it
+                call = call or ""
+
                 eid, country, active = dxcc_prefixes.entity_for_callsign(call)
                 
                 prefix = eid if eid else ""
-                    
-                lotw_date = get_lotw_last_upload(call)
-        
+
                 # Check if LoTW date is over 90 days old
                 lotw_color = ft.Colors.WHITE
-                if lotw_date:
-                    try:
-                        lotw_dt = datetime.fromisoformat(lotw_date)
-                        days_ago = (datetime.now() - lotw_dt).days
-                        if days_ago > 90:
-                            lotw_color = ft.Colors.RED_300
-                    except:
-                        pass
+                if lotw_date and lotw_date < lotw_cutoff:
+                    lotw_color = ft.Colors.RED_300
         
-                display_country = COUNTRY_ABBREVIATIONS.get(country, country) if country else "—"
-                full_country = country or "Unknown"
+                names = country_names.get(country)
+                if names is None:
+                    names = country_names[country] = (
+                        COUNTRY_ABBREVIATIONS.get(country, country) if country else "—",
+                        country or "Unknown",
+                    )
+                display_country, full_country = names
         
                 data_rows.append((prefix, display_country, full_country, call, qso_date, qsl_status, lotw_date, lotw_color, band))
-    
-            # Sort by prefix if that's selected
+
+            return data_rows
+
+        def sort_qso_rows(data_rows):
+            # Rows arrive newest first; sort by prefix if that's selected,
+            # with the worked call as tie-break in the same direction
             if sort_column["name"] == "prefix":
-                data_rows.sort(key=lambda x: x[0], reverse=not sort_column["ascending"])
-                qso_table.sort_column_index = 0
-                qso_table.sort_ascending = sort_column["ascending"]
+                # prefix and call are always str ("" when unresolved)
+                return sorted(data_rows, key=itemgetter(0, 3), reverse=not sort_column["ascending"])
+            return data_rows
+
+        def show_qso_rows(data_rows, generation=None):
+            # Only the first window becomes DataRows; the rest are built
+            # as the user scrolls (see on_qso_scroll). The caller sends
+            # the update; returns False if this refresh was superseded.
+            with qso_view["lock"]:
+                if generation is not None and generation != qso_view["generation"]:
+                    return False  # a newer refresh is already on its way
+
+                if sort_column["name"] == "prefix":
+                    qso_table.sort_column_index = 0
+                    qso_table.sort_ascending = sort_column["ascending"]
+                else:
+                    qso_table.sort_column_index = None
+
+                # Identical QSO lines get their own DataRow each
+                occurrences = defaultdict(int)
+                keys = []
+                for r in data_rows:
+                    keys.append((r, occurrences[r]))
+                    occurrences[r] += 1
+
+                # Keep DataRows that are still part of the result; the
+                # rest go back to the pool
+                row_cache = qso_view["row_cache"]
+                kept = {}
+                for k in keys:
+                    row = row_cache.pop(k, None)
+                    if row is not None:
+                        kept[k] = row
+                qso_view["row_pool"].extend(row_cache.values())
+                qso_view["row_cache"] = kept
+
+                qso_table.rows.clear()
+                qso_view["data_rows"] = keys
+                qso_view["rendered"] = 0
+                render_next_qso_rows()
+
+            return True
+
+        def render_next_qso_rows():
+            # Caller holds qso_view["lock"]
+            start = qso_view["rendered"]
+            window = qso_view["data_rows"][start:start + QSO_PAGE_SIZE]
+            row_cache = qso_view["row_cache"]
+
+            for key in window:
+                row = row_cache.get(key)
+                if row is None:
+                    row = row_cache[key] = make_qso_row(key[0])
+                qso_table.rows.append(row)
+
+            qso_view["rendered"] = start + len(window)
+
+        def make_qso_row(data_row):
+            # Refill a pooled DataRow if there is one - only the text
+            # values change, the controls themselves stay the same
+            if qso_view["row_pool"]:
+                row = qso_view["row_pool"].pop()
             else:
-                qso_table.sort_column_index = None
-    
-            # Build rows
-            for prefix, display_country, full_country, call, qso_date, qsl_status, lotw_date, lotw_color, band in data_rows:
-                qso_table.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(ft.Text(prefix)),
-                            ft.DataCell(
-                                ft.Text(
-                                    display_country,
-                                    max_lines=1,
-                                    overflow=ft.TextOverflow.ELLIPSIS,
-                                    width=150,
-                                    tooltip=full_country,
-                                )
-                            ),
-                            ft.DataCell(ft.Text(call)),
-                            ft.DataCell(ft.Text(qso_date)),
-                            ft.DataCell(ft.Text(qsl_status or "—")),
-                            ft.DataCell(
-                                 ft.Text(
-                                    lotw_date or "—",
-                                    color=lotw_color,
-                                )
-                            ),
-                            ft.DataCell(ft.Text(band or "—")),
-                        ]
-                    )
+                row = ft.DataRow(
+                    cells=[
+                        ft.DataCell(ft.Text()),
+                        ft.DataCell(
+                            ft.Text(
+                                max_lines=1,
+                                overflow=ft.TextOverflow.ELLIPSIS,
+                                width=150,
+                            )
+                        ),
+                        ft.DataCell(ft.Text()),
+                        ft.DataCell(ft.Text()),
+                        ft.DataCell(ft.Text()),
+                        ft.DataCell(ft.Text()),
+                        ft.DataCell(ft.Text()),
+                    ]
                 )
-    
-            con.close()
-            page.update()
-            
+
+            prefix, display_country, full_country, call, qso_date, qsl_status, lotw_date, lotw_color, band = data_row
+            (prefix_txt, country_txt, call_txt, date_txt,
+             qsl_txt, lotw_txt, band_txt) = (cell.content for cell in row.cells)
+
+            prefix_txt.value = prefix
+            country_txt.value = display_country
+            country_txt.tooltip = full_country
+            call_txt.value = call
+            date_txt.value = qso_date
+            qsl_txt.value = qsl_status or "—"
+            lotw_txt.value = lotw_date or "—"
+            lotw_txt.color = lotw_color
+            band_txt.value = band or "—"
+
+            return row
+
+        def on_qso_scroll(e: ft.OnScrollEvent):
+            if e.pixels < e.max_scroll_extent - QSO_SCROLL_MARGIN:
+                return
+
+            with qso_view["lock"]:
+                if qso_view["rendered"] >= len(qso_view["data_rows"]):
+                    return
+                render_next_qso_rows()
+
+            qso_table.update()
+
             
         # ============================================================
         # DASHBOARD (STABLE)
@@ -552,58 +914,33 @@ def main(page: ft.Page):
         # DO NOT MODIFY without checking counts carefully
         # ============================================================
 
-        def refresh_dashboard():
+        def dashboard_counts():
+            # (worked, confirmed) entity counts for the current band filter
             
             # Get the selected band filter
             selected_band = band_filter.value if band_filter.value != "All" else None
-    
-            # Pass the band filter to get_dxcc_dashboard
+
+            # A single band is counted entirely in SQL
+            if selected_band:
+                return get_band_dashboard(user, selected_band)
+
             worked, confirmed, total_active = get_dxcc_dashboard(
                 user,
                 None if track_all else bands,
                 include_deleted,
             )
-    
-            # If band filter is active, filter the worked/confirmed sets
-            if selected_band:
-                # Filter worked entities by band
-                worked_filtered = set()
-                confirmed_filtered = set()
-        
-                con = sqlite3.connect(DB_PATH)
-                cur = con.cursor()
-        
-                # Get entities for selected band
-                cur.execute(
-                   """
-                   SELECT DISTINCT call_worked, qsl_status
-                   FROM qsos
-                   WHERE callsign=? AND band=?
-                   """,
-                   (user, selected_band),
-                )
-        
-                for call, qsl_status in cur.fetchall():
-                    eid, country, active = dxcc_prefixes.entity_for_callsign(call)
-                    if eid:
-                        worked_filtered.add(eid)
-                        if qsl_status == "Confirmed":
-                            confirmed_filtered.add(eid)
-        
-                con.close()
-        
-                worked = worked_filtered
-                confirmed = confirmed_filtered
+            return len(worked), len(confirmed)
 
-            worked_txt.value = str(len(worked))
-            confirmed_txt.value = str(len(confirmed))
-            remaining_txt.value = str(len(worked) - len(confirmed))
-            
-            page.update()
+        def show_dashboard(worked, confirmed):
+            # worked / confirmed are entity counts; returns False if the
+            # numbers shown are already these
+            values = (str(worked), str(confirmed), str(worked - confirmed))
+            if values == (worked_txt.value, confirmed_txt.value, remaining_txt.value):
+                return False
 
+            worked_txt.value, confirmed_txt.value, remaining_txt.value = values
+            return True
 
-        page.update()
-    
         logout_btn = ft.ElevatedButton(
             "Logout",
             icon=ft.Icons.LOGOUT,
@@ -638,88 +975,67 @@ def main(page: ft.Page):
 
         # After import_web_btn definition, add:
 
-        # QSL Status filter dropdown
-        qsl_filter_dropdown = ft.Dropdown(
-            label="Filter by QSL Status",
-            options=[
-                ft.dropdown.Option("All"),
-                ft.dropdown.Option("Confirmed"),
-                ft.dropdown.Option("Requested"),
-                ft.dropdown.Option("Not Requested"),
-            ],
-            value="All",
-            width=200,
-            on_change=lambda e: refresh_qso_table(),
-        )
+        # QSL Status filter dropdown - reused across logins like band_filter
+        qsl_filter_dropdown = cached_control("qsl_filter", _build_qsl_filter)
+        qsl_filter_dropdown.value = "All"
+        qsl_filter_dropdown.on_change = on_filter_change
 
         # -----------------------------
         # Footer
         # -----------------------------
-        footer = ft.Container(
-            content=ft.Row(
+        footer = cached_control("footer", _build_footer)
+
+        # Filters start at "All", so the first render can take the table rows
+        # and dashboard counts from a single query. Filled in before the
+        # view is shown so everything goes out in one update.
+        rows, worked, confirmed, _total_active = get_qsos_and_dashboard(
+            user,
+            None if track_all else bands,
+            include_deleted,
+        )
+        show_dashboard(len(worked), len(confirmed))
+        show_qso_rows(build_qso_rows(rows))
+
+        app_view.controls = [
+            # Header row
+            ft.Row(
                 [
-                    ft.Text(
-                        f"DXCC Need List Tracker • v{APP_VERSION} • Build {BUILD_DATE}",
-                        size=12,
-                        color=ft.Colors.GREY_500,
-                    ),
-                    ft.Text(
-                        "© N4LR",
-                        size=12,
-                        color=ft.Colors.GREY_500,
-                    ),
+                    ft.Text(f"Logged in as {user}", size=18),
+                    logout_btn,
                 ],
                 alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
             ),
-            padding=10,
-)
+            
+            # Admin tools (conditional)
+            admin_panel() if current_user["is_admin"] else ft.Container(),
+            
+            ft.Divider(),
+            dashboard,
+            
+            ft.Divider(),
+            import_btn,
+            import_web_btn,
+            
+            import_progress,
+            import_status,
+            
+            ft.Divider(),
+            qsl_filter_dropdown,
+            callsign_search,
 
-        
-        page.add(
-            ft.Column(
-                [
-                    # Header row
-                    ft.Row(
-                        [
-                            ft.Text(f"Logged in as {user}", size=18),
-                            logout_btn,
-                        ],
-                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                    ),
-                    
-                    # Admin tools (conditional)
-                    admin_panel() if is_admin_user else ft.Container(),
-                    
-                    ft.Divider(),
-                    dashboard,
-                    
-                    ft.Divider(),
-                    import_btn,
-                    import_web_btn,
-                    
-                    import_progress,
-                    import_status,
-                    
-                    ft.Divider(),
-                    qsl_filter_dropdown,
-                    callsign_search,
-
-                    ft.Divider(),
-                    qso_tabs,
-
-                    # 👇 FOOTER
-                    ft.Divider(),
-                    footer,
-                    
-                ],
-                spacing=16,
-            )
-        )
+            ft.Divider(),
+            qso_tabs,
 
-        refresh_dashboard()
-        refresh_qso_table()
+            # 👇 FOOTER
+            ft.Divider(),
+            footer,
+            
+        ]
+
+        login_view.visible = False
+        app_view.visible = True
         page.update()
-    
+
     # -------------------------
     # START APP
     # -------------------------
@@ -1,16 +1,86 @@
 import json
 import os
+import re
 import sqlite3
+import sys
+from operator import itemgetter
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 DB_PATH = os.path.join(BASE_DIR, "dxcc.db")
 DXCC_JSON = os.path.join(DATA_DIR, "dxcc.json")
 
+# One prefix in the comma-separated "prefix" field, surrounding blanks excluded
+_PREFIX_RE = re.compile(r"[^,\s]+")
 
+# The fields every entity in dxcc.json carries, fetched in one call
+_ENTITY_FIELDS = itemgetter("entityCode", "name", "deleted")
 
+# Layout of the tables import_dxcc() builds; bump it whenever that changes
+# so databases built by an older version get rebuilt even though dxcc.json
+# itself hasn't changed. 2: entity_id stored as INTEGER rather than TEXT
+SCHEMA_VERSION = "2"
 
-def import_dxcc():
+
+# Row generators fed straight to executemany, so no intermediate lists
+# of rows are built
+
+def _entity_code(code):
+    """entityCode as the INTEGER the tables store, or None if it isn't one"""
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+def _entity_rows(dxcc_list):
+    """(entity_id, name, active) for each entity in the dxcc list"""
+    for ent in dxcc_list:
+        if not isinstance(ent, dict):
+            continue
+
+        try:
+            code, name, deleted = _ENTITY_FIELDS(ent)
+        except KeyError:
+            # Older or hand-edited files may leave fields out
+            code = ent.get("entityCode")
+            name = ent.get("name", "Unknown")
+            deleted = ent.get("deleted", False)
+
+        entity_id = _entity_code(code)
+        if entity_id is None:
+            print(f"  Skipped {name}: entityCode {code!r} is not a number")
+            continue
+
+        yield entity_id, name, 0 if deleted else 1
+
+
+def _prefix_rows(dxcc_list):
+    """(prefix, entity_id) for each comma-separated prefix of each entity"""
+    for ent in dxcc_list:
+        if not isinstance(ent, dict):
+            continue
+
+        prefix_str = ent.get("prefix", "")
+        if not prefix_str:
+            continue
+
+        # A prefix listed twice for the same entity is stored once;
+        # dict.fromkeys keeps the listed order
+        entity_id = _entity_code(ent.get("entityCode"))
+        if entity_id is None:
+            continue
+
+        for p in dict.fromkeys(_PREFIX_RE.findall(prefix_str.upper())):
+            yield p, entity_id
+
+
+def import_dxcc(force=False):
+    """
+    Rebuild dxcc_entities / dxcc_prefixes from dxcc.json.
+    Does nothing if the file hasn't changed since the last import and
+    the tables are at SCHEMA_VERSION, unless force is set.
+    """
     
     entity_count = 0
     active_count = 0
@@ -19,22 +89,61 @@ def import_dxcc():
     if not os.path.exists(DXCC_JSON):
         raise FileNotFoundError("dxcc.json not found")
 
+    source_mtime = str(os.stat(DXCC_JSON).st_mtime_ns)
+
+    con = sqlite3.connect(DB_PATH)
+    cur = con.cursor()
+
+    # Same journal mode the app sets in init_db(), so the app can keep
+    # reading dxcc.db while this runs; NORMAL is safe under WAL
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+
+    # Remembers which dxcc.json was last imported, and into which layout
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS dxcc_meta (
+            k TEXT PRIMARY KEY,
+            v TEXT
+        )
+        """
+    )
+    cur.execute(
+        "SELECT k, v FROM dxcc_meta "
+        "WHERE k IN ('json_mtime_ns', 'schema_version')"
+    )
+    meta = dict(cur.fetchall())
+    if (
+        meta.get("json_mtime_ns") == source_mtime
+        and meta.get("schema_version") == SCHEMA_VERSION
+        and not force
+    ):
+        con.close()
+        print("DXCC import skipped: dxcc.json unchanged since last import")
+        return
+
     with open(DXCC_JSON, "r", encoding="utf-8") as f:
         root = json.load(f)
 
     if "dxcc" not in root or not isinstance(root["dxcc"], list):
+        con.close()
         raise ValueError("Invalid dxcc.json format (missing 'dxcc' list)")
 
     dxcc_list = root["dxcc"]
 
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
+    # Replace the tables outright rather than deleting row by row. The
+    # explicit BEGIN keeps the drop, re-create and inserts in one
+    # transaction - readers see the old data until commit, never a
+    # missing table.
+    cur.execute("BEGIN")
+    cur.execute("DROP TABLE IF EXISTS dxcc_prefixes")
+    cur.execute("DROP TABLE IF EXISTS dxcc_entities")
 
     # Create tables
     cur.execute(
         """
         CREATE TABLE IF NOT EXISTS dxcc_entities (
-            entity_id TEXT PRIMARY KEY,
+            entity_id INTEGER PRIMARY KEY,
             name TEXT NOT NULL,
             active INTEGER NOT NULL
         )
@@ -44,49 +153,39 @@ def import_dxcc():
         """
         CREATE TABLE IF NOT EXISTS dxcc_prefixes (
             prefix TEXT NOT NULL,
-            entity_id TEXT NOT NULL
+            entity_id INTEGER NOT NULL
         )
         """
     )
 
-    # Clear old data
-    cur.execute("DELETE FROM dxcc_entities")
-    cur.execute("DELETE FROM dxcc_prefixes")
+    # rowcount after executemany is the total number of rows inserted
+    cur.executemany(
+        "INSERT INTO dxcc_entities (entity_id, name, active) VALUES (?, ?, ?)",
+        _entity_rows(dxcc_list),
+    )
+    entity_count = cur.rowcount
 
-    entity_count = 0
-    prefix_count = 0
+    cur.executemany(
+        "INSERT INTO dxcc_prefixes (prefix, entity_id) VALUES (?, ?)",
+        _prefix_rows(dxcc_list),
+    )
+    prefix_count = cur.rowcount
 
-    for ent in dxcc_list:
-        if not isinstance(ent, dict):
-            continue
+    cur.execute("SELECT COUNT(*) FROM dxcc_entities WHERE active=1")
+    active_count = cur.fetchone()[0]
 
-        entity_id = str(ent.get("entityCode"))
-        name = ent.get("name", "Unknown")
-        deleted = bool(ent.get("deleted", False))
-        active = 0 if deleted else 1
-        
-        if active:
-            active_count += 1
-
-        cur.execute(
-            "INSERT INTO dxcc_entities (entity_id, name, active) VALUES (?, ?, ?)",
-            (entity_id, name, active),
-        )
-        entity_count += 1
+    # Built once over the loaded rows rather than maintained per insert;
+    # the DROP TABLE above takes the old index with it
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dxcc_prefixes_prefix "
+        "ON dxcc_prefixes (prefix, entity_id)"
+    )
 
-        prefix_str = ent.get("prefix", "")
-        if prefix_str:
-            prefixes = [
-                p.strip().upper()
-                for p in prefix_str.split(",")
-                if p.strip()
-            ]
-            for p in prefixes:
-                cur.execute(
-                    "INSERT INTO dxcc_prefixes (prefix, entity_id) VALUES (?, ?)",
-                    (p, entity_id),
-                )
-                prefix_count += 1
+    # Committed with the tables, so the markers never outlive a failed run
+    cur.executemany(
+        "INSERT OR REPLACE INTO dxcc_meta VALUES (?, ?)",
+        [("json_mtime_ns", source_mtime), ("schema_version", SCHEMA_VERSION)],
+    )
 
     con.commit()
     con.close()
@@ -97,7 +196,13 @@ def import_dxcc():
         f"{prefix_count} prefixes"
     )
 
+    # Entries that aren't objects or lack a numeric entityCode are skipped
+    # above (the latter named as they go); give the total as well
+    ignored = len(dxcc_list) - entity_count
+    if ignored:
+        print(f"  Ignored {ignored} malformed entries in dxcc.json")
+
 
 
 if __name__ == "__main__":
-    import_dxcc()
+    import_dxcc(force="--force" in sys.argv)
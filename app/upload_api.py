@@ -1,13 +1,18 @@
 from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import tempfile
 import os
 
 from app.adif_import import import_adif
+from app.config import UPLOAD_TMP_DIR
 
 api = FastAPI()
 
+# Uploads are copied to disk this many bytes at a time
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 # Mount static files from root /static directory
 api.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -19,12 +24,22 @@ async def upload_adif(
 ):
     suffix = os.path.splitext(file.filename)[1] or ".adi"
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(await file.read())
+    with tempfile.NamedTemporaryFile(
+        delete=False, suffix=suffix, dir=UPLOAD_TMP_DIR
+    ) as tmp:
+        # Chunked, so a large log is never held in memory whole
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            tmp.write(chunk)
         tmp_path = tmp.name
 
     # ✅ Run importer and CAPTURE results
-    result = import_adif(tmp_path, user)
+    # import_adif() is blocking; run it off the event loop so other
+    # requests are still served while a log imports
+    try:
+        result = await asyncio.to_thread(import_adif, tmp_path, user)
+    finally:
+        # Don't leave copies behind (on tmpfs they would hold memory)
+        os.remove(tmp_path)
 
     return JSONResponse(
         {